@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover - libyaml is optional
+    from yaml import SafeLoader as _Loader
+
 from .utils import derive_parent_url, normalize_url
 
 DEFAULT_CONFIG_PATH = Path(__file__).with_name("crawl_config.yaml")
@@ -15,6 +21,9 @@ DEFAULT_USER_AGENT = (
     "Chrome/122.0.0.0 Safari/537.36"
 )
 
+# Parsed bundles keyed by (resolved path, mtime in ns); edits to the file invalidate the entry.
+_CACHE: Dict[Tuple[str, int], "CrawlSettingsBundle"] = {}
+
 
 @dataclass
 class DelaySettings:
@@ -61,6 +70,7 @@ class TabTraversalSettings:
     max_total_tabs: int = 40
     heading_template: str = "#### [Tab: {group} - {label}]"
     wait_for_activation_ms: int = 4000
+    markdown_concurrency: int = 4
 
     @classmethod
     def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TabTraversalSettings":
@@ -74,6 +84,9 @@ class TabTraversalSettings:
         )
         if wait_for_activation_ms < 500:
             wait_for_activation_ms = 500
+        markdown_concurrency = int(
+            data.get("markdown_concurrency", cls.markdown_concurrency)
+        )
         return cls(
             enabled=bool(data.get("enabled", cls.enabled)),
             max_groups=max(1, max_groups),
@@ -81,6 +94,7 @@ class TabTraversalSettings:
             max_total_tabs=max(1, max_total_tabs),
             heading_template=heading_template or cls.heading_template,
             wait_for_activation_ms=wait_for_activation_ms,
+            markdown_concurrency=max(1, markdown_concurrency),
         )
 
 
@@ -96,6 +110,7 @@ class CrawlParameters:
     page_timeout_ms: int = 120_000
     wait_for_timeout_ms: Optional[int] = None
     scope_mode: str = "parent"
+    robots_cache_dir: Optional[Path] = None
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "CrawlParameters":
@@ -117,6 +132,8 @@ class CrawlParameters:
         scope_mode = str(data.get("scope_mode", cls.scope_mode)).strip().lower()
         if scope_mode not in {"parent", "seed"}:
             scope_mode = cls.scope_mode
+        robots_cache = data.get("robots_cache_dir")
+        robots_cache_dir = Path(robots_cache).expanduser() if robots_cache else None
 
         return cls(
             seed_url=str(data["seed_url"]),
@@ -129,6 +146,7 @@ class CrawlParameters:
             page_timeout_ms=page_timeout_ms,
             wait_for_timeout_ms=wait_for_timeout_ms,
             scope_mode=scope_mode,
+            robots_cache_dir=robots_cache_dir,
         )
 
     @property
@@ -157,6 +175,9 @@ def load_settings(path: Optional[str | Path] = None) -> CrawlSettingsBundle:
     """
     Load settings from YAML and return a ready-to-use dataclass.
 
+    Results are memoized per file and modification time; every call returns a
+    fresh copy so callers may mutate it freely.
+
     Args:
         path: Optional override path. Defaults to ``crawl_config.yaml`` next to this module.
     """
@@ -168,12 +189,19 @@ def load_settings(path: Optional[str | Path] = None) -> CrawlSettingsBundle:
             "Please create it before running the crawler."
         )
 
+    cache_key = (str(config_path.resolve()), config_path.stat().st_mtime_ns)
+    cached = _CACHE.get(cache_key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
     with config_path.open("r", encoding="utf-8") as handle:
-        raw_config = yaml.safe_load(handle) or {}
+        raw_config = yaml.load(handle, Loader=_Loader) or {}
 
     browser = BrowserSettings.from_dict(raw_config.get("browser"))
     delay = DelaySettings.from_dict(raw_config.get("delay"))
     crawl = CrawlParameters.from_dict(raw_config.get("crawl", {}))
     tabs = TabTraversalSettings.from_dict(raw_config.get("tab_traversal"))
 
-    return CrawlSettingsBundle(browser=browser, crawl=crawl, delay=delay, tabs=tabs)
+    bundle = CrawlSettingsBundle(browser=browser, crawl=crawl, delay=delay, tabs=tabs)
+    _CACHE[cache_key] = bundle
+    return copy.deepcopy(bundle)
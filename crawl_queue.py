@@ -1,31 +1,63 @@
 from __future__ import annotations
 
+import hashlib
 from collections import deque
-from typing import Deque, Iterable, List, Optional, Set
+from typing import Deque, Dict, Iterable, List, Optional, Set
 
-from .utils import is_within_scope, normalize_url
+from .utils import UrlInfo, is_within_scope, normalize_url, parse_url
 
 
 class CrawlQueue:
-    """Queue wrapper that deduplicates URLs and enforces the parent constraint."""
+    """
+    Queue wrapper that deduplicates URLs and enforces the parent constraint.
+
+    Pending URLs are sharded per host and batches are drawn round-robin across
+    hosts, so concurrent workers spread over origins instead of piling onto one.
+    """
 
     def __init__(self, scope_url: str, respect_parent: bool = True) -> None:
         self._scope_url = scope_url
         self._respect_parent = respect_parent
-        self._pending: Deque[str] = deque()
+        # Parse the scope once; each candidate is parsed once in ``add`` as well.
+        self._scope: Optional[UrlInfo] = (
+            parse_url(normalize_url(scope_url) or scope_url) if scope_url else None
+        )
+        # A deque per host plus one membership set is deliberate: both hold references
+        # to the same string objects, FIFO pops stay O(1), and a single ordered dict
+        # either degrades to quadratic front-pops (dict) or doubles memory (OrderedDict).
+        self._pending: Dict[str, Deque[str]] = {}
+        self._hosts: Deque[str] = deque()
+        self._pending_count = 0
+        self._new_hosts: List[str] = []
         self._queued: Set[str] = set()
-        self._seen: Set[str] = set()
+        # Visited URLs are kept as 8-byte fingerprints rather than full strings, so the
+        # visited set itself stays small; 64-bit collisions are negligible here. The URL
+        # helper caches in ``utils`` still hold strings, bounded by ``_URL_CACHE_SIZE``.
+        self._seen: Set[bytes] = set()
+        self._scheduled = 0
 
     def add(self, url: str, base_url: Optional[str] = None) -> bool:
         normalized = normalize_url(url, base_url)
         if not normalized:
             return False
-        if self._respect_parent and not is_within_scope(normalized, self._scope_url):
+        info = parse_url(normalized)
+        if (
+            self._respect_parent
+            and self._scope is not None
+            and not is_within_scope(info, self._scope)
+        ):
             return False
-        if normalized in self._queued or normalized in self._seen:
+        if normalized in self._queued or self._fingerprint(normalized) in self._seen:
             return False
-        self._pending.append(normalized)
+        host = info.domain_key
+        bucket = self._pending.get(host)
+        if bucket is None:
+            bucket = self._pending[host] = deque()
+            self._hosts.append(host)
+            self._new_hosts.append(host)
+        bucket.append(normalized)
         self._queued.add(normalized)
+        self._pending_count += 1
         return True
 
     def extend(self, urls: Iterable[str], base_url: Optional[str] = None) -> int:
@@ -37,20 +69,38 @@ class CrawlQueue:
 
     def next_batch(self, size: int) -> List[str]:
         batch: List[str] = []
-        while self._pending and len(batch) < size:
-            url = self._pending.popleft()
+        while self._hosts and len(batch) < size:
+            host = self._hosts.popleft()
+            bucket = self._pending[host]
+            url = bucket.popleft()
+            if bucket:
+                self._hosts.append(host)
+            else:
+                del self._pending[host]
+            self._pending_count -= 1
             self._queued.discard(url)
-            self._seen.add(url)
+            self._seen.add(self._fingerprint(url))
+            self._scheduled += 1
             batch.append(url)
         return batch
 
+    def take_new_hosts(self) -> List[str]:
+        """Return origins that gained a pending bucket since the previous call."""
+
+        hosts, self._new_hosts = self._new_hosts, []
+        return hosts
+
     @property
     def pending(self) -> int:
-        return len(self._pending)
+        return self._pending_count
 
     @property
     def scheduled(self) -> int:
-        return len(self._seen)
+        return self._scheduled
 
     def __bool__(self) -> bool:
-        return bool(self._pending)
+        return self._pending_count > 0
+
+    @staticmethod
+    def _fingerprint(url: str) -> bytes:
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
@@ -3,10 +3,13 @@ from __future__ import annotations
 import asyncio
 import logging
 import copy
+import os
+import socket
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig
 
@@ -14,7 +17,7 @@ from .config_loader import CrawlSettingsBundle
 from .crawl_queue import CrawlQueue
 from .robots_manager import RobotsInfo, RobotsManager
 from .throttle import ThrottleController
-from .utils import build_markdown_path, domain_key
+from .utils import build_markdown_path, domain_key, parse_url
 from .tab_traversal import TabTraversalManager, TabMarkdownBlock
 
 
@@ -35,6 +38,25 @@ class DiscoveredLinks:
     hrefs: List[str] = field(default_factory=list)
 
 
+@dataclass
+class FetchedPage:
+    """The parts of a Crawl4AI result the orchestrator reads, unpacked once per page."""
+
+    url: Optional[str]
+    markdown: Any
+    redirected_url: Optional[str]
+    links: Dict[str, List[Dict[str, Any]]]
+
+    @classmethod
+    def from_result(cls, result: Any) -> "FetchedPage":
+        return cls(
+            url=getattr(result, "url", None),
+            markdown=getattr(result, "markdown", None),
+            redirected_url=getattr(result, "redirected_url", None),
+            links=getattr(result, "links", None) or {},
+        )
+
+
 class CrawlOrchestrator:
     """Coordinates the Crawl4AI session together with robots + throttling logic."""
 
@@ -44,21 +66,31 @@ class CrawlOrchestrator:
             scope_url=settings.crawl.scope_url,
             respect_parent=settings.crawl.respect_parent_path,
         )
-        self._robots = RobotsManager(settings.browser.user_agent)
+        self._robots = RobotsManager(
+            settings.browser.user_agent,
+            cache_dir=settings.crawl.robots_cache_dir,
+        )
         self._throttle = ThrottleController(
             min_seconds=settings.delay.min_seconds,
             max_seconds=settings.delay.max_seconds,
         )
-        self._logged_robots: set[str] = set()
         self._stats = CrawlStats()
+        self._dns_warmed: set[str] = set()
+        self._dns_tasks: set[asyncio.Task] = set()
         self._run_config = CrawlerRunConfig(
             cache_mode=CacheMode.BYPASS,
             page_timeout=self.settings.crawl.page_timeout_ms,
             wait_for_timeout=self.settings.crawl.wait_for_timeout_ms,
         )
         self._tab_manager = TabTraversalManager(settings.tabs)
-        self._output_dir: Path = settings.crawl.output_dir
+        # Sessions only exist to let tab traversal reattach to the page; skip them otherwise.
+        self._use_sessions = self._tab_manager.enabled
+        # Absolute so the directory memo below survives a change of working directory.
+        self._output_dir: Path = settings.crawl.output_dir.resolve()
         self._output_dir.mkdir(parents=True, exist_ok=True)
+        # Output directories this orchestrator created; a new run starts empty, so a
+        # wiped output tree is recreated.
+        self._created_dirs: set[Path] = set()
 
     async def run(self) -> CrawlStats:
         """Kick off the crawl and return summary statistics."""
@@ -67,6 +99,7 @@ class CrawlOrchestrator:
             seed_added = self._queue.add(self.settings.crawl.seed_url)
             if not seed_added:
                 raise RuntimeError("Seed URL could not be enqueued. Check configuration.")
+            self._warm_new_hosts()
 
             browser_config = BrowserConfig(
                 headless=self.settings.browser.headless,
@@ -78,6 +111,8 @@ class CrawlOrchestrator:
                 await self._log_seed_robots()
                 await self._drain_queue(crawler)
         finally:
+            for task in self._dns_tasks:
+                task.cancel()
             await self._robots.close()
 
         return self._stats
@@ -89,29 +124,70 @@ class CrawlOrchestrator:
             logger.warning("Seed URL is disallowed by robots.txt. No crawling performed.")
 
     async def _drain_queue(self, crawler: AsyncWebCrawler) -> None:
-        while self._queue.pending and self._stats.attempted < self.settings.crawl.max_pages:
-            remaining = self.settings.crawl.max_pages - self._stats.attempted
-            batch_size = min(self.settings.crawl.concurrency, remaining)
-            urls = self._queue.next_batch(batch_size)
-            if not urls:
-                break
-
-            self._stats.attempted += len(urls)
-            results = await asyncio.gather(
-                *[self._crawl_single(crawler, url) for url in urls],
-                return_exceptions=True,
-            )
+        # Keep up to ``concurrency`` pages in flight and refill a slot as soon as any
+        # page finishes, so one slow page never stalls the others.
+        max_pages = self.settings.crawl.max_pages
+        concurrency = self.settings.crawl.concurrency
+        in_flight: Dict[asyncio.Task, str] = {}
+        try:
+            while True:
+                while len(in_flight) < concurrency and self._stats.attempted < max_pages:
+                    urls = self._queue.next_batch(1)
+                    if not urls:
+                        break
+                    self._stats.attempted += 1
+                    task = asyncio.create_task(self._crawl_single(crawler, urls[0]))
+                    in_flight[task] = urls[0]
+                if not in_flight:
+                    break
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    self._enqueue_discovered(in_flight.pop(task), task)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
 
-            for url, outcome in zip(urls, results):
-                if isinstance(outcome, Exception):
-                    self._stats.failures += 1
-                    logger.error("Error while crawling %s: %s", url, outcome)
-                    continue
-                if not isinstance(outcome, DiscoveredLinks):
-                    continue
-                added = self._queue.extend(outcome.hrefs, base_url=outcome.page_url)
-                if added:
-                    logger.debug("Queued %d new URLs from %s", added, url)
+    def _enqueue_discovered(self, url: str, task: asyncio.Task) -> None:
+        try:
+            outcome = task.result()
+        except Exception as exc:
+            self._stats.failures += 1
+            logger.error("Error while crawling %s: %s", url, exc)
+            return
+        if not isinstance(outcome, DiscoveredLinks):
+            return
+        added = self._queue.extend(outcome.hrefs, base_url=outcome.page_url)
+        if added:
+            logger.debug("Queued %d new URLs from %s", added, url)
+            self._warm_new_hosts()
+
+    def _warm_new_hosts(self) -> None:
+        """Resolve newly queued origins in the background to warm the resolver cache."""
+
+        for origin in self._queue.take_new_hosts():
+            if origin in self._dns_warmed:
+                continue
+            self._dns_warmed.add(origin)
+            task = asyncio.create_task(self._warm_dns(origin))
+            self._dns_tasks.add(task)
+            task.add_done_callback(self._dns_tasks.discard)
+
+    async def _warm_dns(self, origin: str) -> None:
+        try:
+            parsed = urlparse(origin)
+            host = parsed.hostname
+            port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        except ValueError:
+            return
+        if not host:
+            return
+        try:
+            await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as exc:
+            logger.debug("DNS pre-resolution failed for %s: %s", host, exc)
 
     async def _crawl_single(self, crawler: AsyncWebCrawler, url: str) -> DiscoveredLinks:
         allowed, robots_info = await self._robots.allowed(url)
@@ -121,56 +197,69 @@ class CrawlOrchestrator:
             logger.info("Skipped %s due to robots.txt restrictions.", url)
             return DiscoveredLinks(page_url=url)
 
-        await self._throttle.wait_for_turn(url, robots_info.crawl_delay)
+        await self._throttle.wait_for_turn(parse_url(url), robots_info.crawl_delay)
 
-        session_id = str(uuid.uuid4()) if self._tab_manager.enabled else None
-        run_config = self._clone_run_config(session_id=session_id)
         tab_blocks: List[TabMarkdownBlock] = []
+        if self._use_sessions:
+            session_id = str(uuid.uuid4())
+            try:
+                page = await self._fetch_page(
+                    crawler, url, self._clone_run_config(session_id)
+                )
+                if page is not None:
+                    tab_blocks = await self._tab_manager.collect_markdown_blocks(
+                        crawler=crawler,
+                        url=page.url or url,
+                        base_config=self._run_config,
+                        session_id=session_id,
+                    )
+            finally:
+                await self._cleanup_session(crawler, session_id)
+        else:
+            page = await self._fetch_page(crawler, url, self._run_config)
+        if page is None:
+            return DiscoveredLinks(page_url=url)
+
+        combined_markdown = self._merge_markdown(page.markdown, tab_blocks)
+        if combined_markdown:
+            saved_path = self._persist_markdown(page.url, combined_markdown)
+            self._stats.saved_pages += 1
+            logger.info("Saved %s to %s", url, saved_path)
+        else:
+            logger.info("No markdown content returned for %s", url)
+
+        source_url = page.redirected_url or page.url or url
+        new_links = self._extract_links(page.links, tab_blocks)
+        return DiscoveredLinks(page_url=source_url, hrefs=new_links)
+
+    async def _fetch_page(
+        self, crawler: AsyncWebCrawler, url: str, run_config: CrawlerRunConfig
+    ) -> Optional[FetchedPage]:
+        """Run Crawl4AI for ``url`` and return the unpacked result, or ``None`` on failure."""
 
         try:
             result = await crawler.arun(url=url, config=run_config)
         except Exception as exc:
             self._stats.failures += 1
             logger.exception("Crawler threw an exception for %s: %s", url, exc)
-            await self._cleanup_session(crawler, session_id)
-            return DiscoveredLinks(page_url=url)
+            return None
 
         if not getattr(result, "success", True):
             self._stats.failures += 1
             message = getattr(result, "error_message", "unknown error")
             logger.warning("Crawling %s failed: %s", url, message)
-            await self._cleanup_session(crawler, session_id)
-            return DiscoveredLinks(page_url=url)
-
-        markdown = getattr(result, "markdown", None)
-        if self._tab_manager.enabled and session_id:
-            tab_blocks = await self._tab_manager.collect_markdown_blocks(
-                crawler=crawler,
-                url=result.url or url,
-                base_config=self._run_config,
-                session_id=session_id,
-            )
-
-        await self._cleanup_session(crawler, session_id)
-
-        combined_markdown = self._merge_markdown(markdown, tab_blocks)
-        if combined_markdown:
-            saved_path = self._persist_markdown(result.url, combined_markdown)
-            self._stats.saved_pages += 1
-            logger.info("Saved %s to %s", url, saved_path)
-        else:
-            logger.info("No markdown content returned for %s", url)
-
-        source_url = getattr(result, "redirected_url", None) or result.url or url
-        new_links = self._extract_links(result, tab_blocks)
-        return DiscoveredLinks(page_url=source_url, hrefs=new_links)
+            return None
+        return FetchedPage.from_result(result)
 
     async def _log_robots_info(self, info: RobotsInfo) -> None:
+        if info.logged:
+            return
+        info.logged = True
+        # Building the snippet copies the whole robots.txt; skip it when INFO is off.
+        if not logger.isEnabledFor(logging.INFO):
+            return
         source = info.url or self.settings.crawl.seed_url
         origin = domain_key(source)
-        if origin in self._logged_robots:
-            return
-        self._logged_robots.add(origin)
         snippet = info.raw_text.strip() or "<empty>"
         if len(snippet) > 800:
             snippet = f"{snippet[:800]}..."
@@ -182,21 +271,24 @@ class CrawlOrchestrator:
         )
 
     def _persist_markdown(self, url: str, markdown_text: str) -> Path:
-        path = build_markdown_path(self._output_dir, url)
-        with path.open("w", encoding="utf-8") as handle:
-            handle.write(f"# Source: {url}\n\n")
-            handle.write(markdown_text.strip())
-            handle.write("\n")
+        path = build_markdown_path(self._output_dir, url, self._created_dirs)
+        payload = f"# Source: {url}\n\n{markdown_text.strip()}\n".encode("utf-8")
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
         return path
 
-    def _clone_run_config(self, session_id: Optional[str] = None) -> CrawlerRunConfig:
-        cloned = copy.deepcopy(self._run_config)
+    def _clone_run_config(self, session_id: str) -> CrawlerRunConfig:
+        # Only ``session_id`` differs between pages, so a shallow copy is enough.
+        cloned = copy.copy(self._run_config)
         cloned.session_id = session_id
         return cloned
 
-    async def _cleanup_session(self, crawler: AsyncWebCrawler, session_id: Optional[str]) -> None:
-        if not session_id:
-            return
+    async def _cleanup_session(self, crawler: AsyncWebCrawler, session_id: str) -> None:
         try:
             await crawler.crawler_strategy.kill_session(session_id)
         except Exception:
@@ -213,19 +305,25 @@ class CrawlOrchestrator:
         return base_text or None
 
     def _extract_links(
-        self, result, tab_blocks: Optional[List[TabMarkdownBlock]] = None
+        self,
+        link_groups: Dict[str, List[Dict[str, Any]]],
+        tab_blocks: Optional[List[TabMarkdownBlock]] = None,
     ) -> List[str]:
+        # Anchors repeat heavily (nav menus, tab panels); drop duplicates here so the
+        # queue only normalizes each distinct href once per page.
         collected: List[str] = []
-        link_groups = getattr(result, "links", {}) or {}
+        seen_local: set[str] = set()
         for group in ("internal", "external"):
             for link in link_groups.get(group, []):
                 href = (link.get("href") or "").strip()
-                if href:
+                if href and href not in seen_local:
+                    seen_local.add(href)
                     collected.append(href)
         if tab_blocks:
             for block in tab_blocks:
                 for href in block.links:
                     href = (href or "").strip()
-                    if href:
+                    if href and href not in seen_local:
+                        seen_local.add(href)
                         collected.append(href)
         return collected
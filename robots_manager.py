@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+import time
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse, urlunparse
 from urllib import robotparser
@@ -10,6 +17,10 @@ import httpx
 
 from .utils import domain_key
 
+# HTTP/2 needs the optional ``h2`` package (``httpx[http2]``); fall back to HTTP/1.1 without it.
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+DEFAULT_CACHE_TTL_SECONDS = 24 * 60 * 60
+
 
 @dataclass
 class RobotsInfo:
@@ -17,22 +28,45 @@ class RobotsInfo:
     parser: robotparser.RobotFileParser
     raw_text: str
     crawl_delay: float
+    logged: bool = False
+    allow_all: bool = False
 
     def can_fetch(self, user_agent: str, target_url: str) -> bool:
-        if not self.parser:
+        if self.allow_all or not self.parser:
             return True
         return self.parser.can_fetch(user_agent, target_url)
 
 
 class RobotsManager:
-    """Fetches and caches robots.txt directives per origin."""
-
-    def __init__(self, user_agent: str, timeout: float = 15.0) -> None:
+    """
+    Fetches and caches robots.txt directives per origin.
+
+    When ``cache_dir`` is given, raw robots.txt bodies are also persisted there so
+    later runs can skip the download until ``cache_ttl`` seconds have passed.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        timeout: float = 15.0,
+        cache_dir: Optional[Path] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+    ) -> None:
         self._user_agent = user_agent
         self._timeout = timeout
+        self._cache_dir = cache_dir
+        self._cache_ttl = cache_ttl
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
         self._client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
             follow_redirects=True,
             timeout=timeout,
+            limits=httpx.Limits(
+                max_keepalive_connections=64,
+                max_connections=128,
+                keepalive_expiry=300.0,
+            ),
             headers={"User-Agent": user_agent},
         )
         self._cache: Dict[str, RobotsInfo] = {}
@@ -43,18 +77,9 @@ class RobotsManager:
 
     async def allowed(self, url: str) -> Tuple[bool, RobotsInfo]:
         info = await self._get_info(url)
-        if info is None:
-            # No robots file found, default allow
-            dummy = robotparser.RobotFileParser()
-            return True, RobotsInfo(
-                url="",
-                parser=dummy,
-                raw_text="",
-                crawl_delay=0.0,
-            )
         return info.can_fetch(self._user_agent, url), info
 
-    async def _get_info(self, url: str) -> Optional[RobotsInfo]:
+    async def _get_info(self, url: str) -> RobotsInfo:
         origin = domain_key(url)
         if origin in self._cache:
             return self._cache[origin]
@@ -64,19 +89,75 @@ class RobotsManager:
             if origin in self._cache:
                 return self._cache[origin]
             robots_url = self._build_robots_url(origin)
-            info = await self._download(robots_url)
+            text = self._read_disk_cache(origin)
+            if text is None:
+                text = await self._download(robots_url)
+                if text is not None:
+                    self._write_disk_cache(origin, text)
+            info = self._build_info(robots_url, text or "")
             self._cache[origin] = info
             return info
 
-    async def _download(self, robots_url: str) -> RobotsInfo:
-        text = ""
+    async def _download(self, robots_url: str) -> Optional[str]:
+        """
+        Return the robots.txt body, ``""`` when the origin definitively has none (4xx),
+        or ``None`` for network errors and transient answers (429, 5xx) that must not
+        be persisted.
+        """
+
         try:
             response = await self._client.get(robots_url)
-            if response.status_code == 200:
-                text = response.text
         except Exception:
-            text = ""
-
+            return None
+        status = response.status_code
+        if status == 200:
+            return response.text
+        if 400 <= status < 500 and status != 429:
+            return ""
+        return None
+
+    def _cache_path(self, origin: str) -> Optional[Path]:
+        if self._cache_dir is None:
+            return None
+        digest = hashlib.sha1(origin.encode("utf-8")).hexdigest()
+        return self._cache_dir / f"{digest}.json"
+
+    def _read_disk_cache(self, origin: str) -> Optional[str]:
+        path = self._cache_path(origin)
+        if path is None:
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+            fetched_at = float(entry["fetched_at"])
+            raw_text = str(entry["raw_text"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if time.time() - fetched_at > self._cache_ttl:
+            return None
+        return raw_text
+
+    def _write_disk_cache(self, origin: str, raw_text: str) -> None:
+        path = self._cache_path(origin)
+        if path is None:
+            return
+        entry = {"origin": origin, "fetched_at": time.time(), "raw_text": raw_text}
+        tmp_name: Optional[str] = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+            ) as handle:
+                tmp_name = handle.name
+                json.dump(entry, handle)
+            os.replace(tmp_name, path)
+        except (OSError, ValueError):
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _build_info(self, robots_url: str, text: str) -> RobotsInfo:
         parser = robotparser.RobotFileParser()
         parser.set_url(robots_url)
         if text:
@@ -91,6 +172,26 @@ class RobotsManager:
             parser=parser,
             raw_text=text,
             crawl_delay=delay,
+            allow_all=not self._has_disallow_rules(parser),
+        )
+
+    @staticmethod
+    def _has_disallow_rules(parser: robotparser.RobotFileParser) -> bool:
+        """
+        Return True when any group restricts access.
+
+        Most documentation sites publish permissive robots.txt files; without a
+        single ``Disallow`` line every ``can_fetch`` answer is True, so it can be
+        decided once per origin instead of re-walking the rules for each URL.
+        """
+
+        if parser.disallow_all:
+            return True
+        entries = list(parser.entries)
+        if parser.default_entry:
+            entries.append(parser.default_entry)
+        return any(
+            not line.allowance for entry in entries for line in entry.rulelines
         )
 
     def _extract_delay(self, parser: robotparser.RobotFileParser) -> float:
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import copy
+import hashlib
 import logging
+import re
+import string
+import uuid
 from dataclasses import dataclass, field
 from textwrap import dedent
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
@@ -14,18 +19,26 @@ from .config_loader import TabTraversalSettings
 
 logger = logging.getLogger(__name__ + ".tabs")
 
+_TABLIST_SETTLE_MS = 600
+_EDGE_SCAN_CHARS = 256
+_WRAP_PREFIX = "<html><body>"
+_WRAP_SUFFIX = "</body></html>"
+# Placeholders a heading template may use; anything else falls back to the default.
+_HEADING_FIELDS = frozenset({"group", "label", "index", "group_index"})
+_DEFAULT_HEADING_TEMPLATE = "#### [Tab: {group} - {label}]"
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class TabCapture:
     group_title: str
     tab_label: str
     html: str
     index: int
     group_index: int
-    text_digest: str
+    text_digest: bytes
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TabMarkdownBlock:
     group_title: str
     tab_label: str
@@ -36,23 +49,116 @@ class TabMarkdownBlock:
 
 
 class TabTraversalManager:
-    _LABEL_HINTS = [
-        "pip",
-        "uv",
-        "conda",
-        "npm",
-        "yarn",
-        "pnpm",
-        "curl",
-        "http",
-        "wget",
-        "bash",
-        "powershell",
-        "python",
-    ]
+    _LABEL_HINTS = frozenset(
+        {
+            "pip",
+            "uv",
+            "conda",
+            "npm",
+            "yarn",
+            "pnpm",
+            "curl",
+            "http",
+            "wget",
+            "bash",
+            "powershell",
+            "python",
+        }
+    )
+
+    # Page scripts are built once at import; Playwright re-sends identical source.
+    _GROUP_TITLE_JS = dedent(
+        """
+        (el) => {
+            if (!el) return 'Tabs';
+            const normalize = (value) => (value || '').replace(/\\s+/g, ' ').trim();
+            const aria = normalize(el.getAttribute('aria-label'));
+            if (aria) return aria;
+            let node = el;
+            for (let depth = 0; depth < 4 && node; depth += 1) {
+                const prev = node.previousElementSibling;
+                if (prev && /^H[1-6]$/.test(prev.tagName)) {
+                    return normalize(prev.textContent);
+                }
+                node = node.parentElement;
+            }
+            return 'Tabs';
+        }
+        """
+    )
+
+    _WAIT_ACTIVE_JS = dedent(
+        """
+        tab => {
+            if (!tab) return false;
+            const selected = tab.getAttribute('aria-selected');
+            const state = tab.dataset.state;
+            return selected === 'true' || state === 'active';
+        }
+        """
+    )
+
+    _EXTRACT_PANEL_JS = dedent(
+        """
+        tab => {
+            if (!tab) return '';
+            const controlId = tab.getAttribute('aria-controls');
+            let panel = controlId ? document.getElementById(controlId) : null;
+            if (!panel && tab.id) {
+                panel = document.querySelector('[aria-labelledby="' + tab.id + '"]');
+            }
+            if (!panel) {
+                const root = tab.closest('[data-component-part="code-group"], .code-group');
+                if (root) {
+                    panel = root.querySelector('[role="tabpanel"]:not([hidden])');
+                }
+            }
+            return panel ? panel.innerHTML || '' : '';
+        }
+        """
+    )
+
+    _TAB_LABELS_JS = "(tabs) => tabs.map((tab) => (tab.innerText || '').trim())"
+
+    # Resolves every labelled tab's panel up front; bails out with null when a panel
+    # is missing, empty, or shared between tabs (content swapped in on click).
+    _BULK_HARVEST_JS = dedent(
+        """
+        (tablist, limit) => {
+            const tabs = Array.from(tablist.querySelectorAll('[role="tab"]')).slice(0, limit);
+            const seenPanels = new Set();
+            const results = [];
+            for (let index = 0; index < tabs.length; index += 1) {
+                const tab = tabs[index];
+                const label = (tab.innerText || '').trim();
+                if (!label) continue;
+                const controlId = tab.getAttribute('aria-controls');
+                let panel = controlId ? document.getElementById(controlId) : null;
+                if (!panel && tab.id) {
+                    panel = document.querySelector('[aria-labelledby="' + tab.id + '"]');
+                }
+                if (!panel) {
+                    const root = tab.closest('[data-component-part="code-group"], .code-group');
+                    if (root) {
+                        panel = root.querySelectorAll('[role="tabpanel"]')[index] || null;
+                    }
+                }
+                const html = panel ? panel.innerHTML || '' : '';
+                if (!html || seenPanels.has(panel)) return null;
+                seenPanels.add(panel);
+                results.push({ label, html, index });
+            }
+            return results;
+        }
+        """
+    )
 
     def __init__(self, settings: TabTraversalSettings) -> None:
         self._settings = settings
+        # The template is fixed for the crawl, so validate it and bind its formatter once.
+        self._format_heading = self._compile_heading(
+            settings.heading_template or "#### [Tab: {label}]"
+        )
 
     @property
     def enabled(self) -> bool:
@@ -76,17 +182,33 @@ class TabTraversalManager:
         if not captures:
             return []
 
-        blocks: List[TabMarkdownBlock] = []
-        seen: set[str] = set()
+        # Synced tab groups repeat the same panel under the same title and label;
+        # keep the first capture per fingerprint, in capture order.
+        first_by_key: Dict[Tuple[str, str, bytes], TabCapture] = {}
         for capture in captures:
-            digest_key = capture.group_title + capture.tab_label + capture.text_digest
-            if digest_key in seen:
-                continue
-            seen.add(digest_key)
-
-            markdown, links = await self._html_fragment_to_markdown(
-                crawler, base_config, url, capture.html
+            first_by_key.setdefault(
+                (capture.group_title, capture.tab_label, capture.text_digest), capture
             )
+        unique = list(first_by_key.values())
+
+        processing_config = self._processing_config(base_config)
+        conversions = await self._batch_fragments_to_markdown(
+            crawler, processing_config, url, [capture.html for capture in unique]
+        )
+        if conversions is None:
+            # Fragments convert independently; overlap them, bounded by the setting.
+            semaphore = asyncio.Semaphore(self._settings.markdown_concurrency)
+
+            async def convert(capture: TabCapture) -> Tuple[Optional[str], List[str]]:
+                async with semaphore:
+                    return await self._html_fragment_to_markdown(
+                        crawler, processing_config, url, capture.html
+                    )
+
+            conversions = await asyncio.gather(*[convert(capture) for capture in unique])
+
+        blocks: List[TabMarkdownBlock] = []
+        for capture, (markdown, links) in zip(unique, conversions):
             if not markdown and not links:
                 continue
             markdown = (markdown or "").strip()
@@ -108,18 +230,23 @@ class TabTraversalManager:
             logger.info("Captured %d tab blocks for %s", len(blocks), url)
         return blocks
 
+    @staticmethod
+    def _processing_config(base_config: CrawlerRunConfig) -> CrawlerRunConfig:
+        """Shallow copy of ``base_config`` with browser-only options cleared; shared by all fragments."""
+
+        processing_config = copy.copy(base_config)
+        processing_config.session_id = None
+        processing_config.js_code = None
+        processing_config.js_only = False
+        return processing_config
+
     async def _html_fragment_to_markdown(
         self,
         crawler: AsyncWebCrawler,
-        base_config: CrawlerRunConfig,
+        processing_config: CrawlerRunConfig,
         url: str,
         html_fragment: str,
     ) -> Tuple[Optional[str], List[str]]:
-        processing_config = copy.deepcopy(base_config)
-        processing_config.session_id = None
-        processing_config.js_code = None
-        processing_config.js_only = False
-
         wrapped_html = self._wrap_fragment(html_fragment)
         try:
             result = await crawler.aprocess_html(
@@ -140,7 +267,71 @@ class TabTraversalManager:
         if not markdown:
             return None, links
         return markdown.raw_markdown, links
-@@
+
+    async def _batch_fragments_to_markdown(
+        self,
+        crawler: AsyncWebCrawler,
+        processing_config: CrawlerRunConfig,
+        url: str,
+        html_fragments: List[str],
+    ) -> Optional[List[Tuple[Optional[str], List[str]]]]:
+        """
+        Convert all fragments with a single ``aprocess_html`` call.
+
+        Each fragment is preceded by a unique text sentinel that survives the
+        HTML-to-markdown pass, and the markdown is split back on those sentinels.
+        Links of the combined document are attributed to the segment whose
+        markdown mentions them; leftovers go to the first segment so discovery
+        never loses them. Returns ``None`` whenever the split cannot be trusted,
+        letting the caller convert fragment by fragment instead.
+        """
+
+        if len(html_fragments) < 2:
+            return None
+        snippets = [(fragment or "").strip() for fragment in html_fragments]
+        if any("<html" in snippet[:_EDGE_SCAN_CHARS].lower() for snippet in snippets):
+            return None
+
+        token = f"TABSPLIT{uuid.uuid4().hex}"
+        combined = "".join(
+            f"<p>{token}{index:04d}</p><div>{snippet}</div>"
+            for index, snippet in enumerate(snippets)
+        )
+        wrapped_html = "".join((_WRAP_PREFIX, combined, _WRAP_SUFFIX))
+        try:
+            result = await crawler.aprocess_html(
+                url=url,
+                html=wrapped_html,
+                extracted_content=wrapped_html,
+                config=processing_config,
+                screenshot_data=None,
+                pdf_data=None,
+                verbose=False,
+            )
+        except Exception as exc:  # pragma: no cover
+            logger.debug("Batched tab conversion failed for %s: %s", url, exc)
+            return None
+
+        markdown = getattr(result, "markdown", None)
+        raw_markdown = getattr(markdown, "raw_markdown", None) if markdown else None
+        if not raw_markdown:
+            return None
+        pieces = re.split(rf"{token}(\d{{4}})", raw_markdown)
+        indices = [int(piece) for piece in pieces[1::2]]
+        if indices != list(range(len(snippets))):
+            return None
+        segments = [segment.strip() for segment in pieces[2::2]]
+
+        segment_links: List[List[str]] = [[] for _ in segments]
+        for href in self._collect_links(result):
+            owner = next(
+                (index for index, segment in enumerate(segments) if href in segment), 0
+            )
+            segment_links[owner].append(href)
+        return [
+            (segment or None, links) for segment, links in zip(segments, segment_links)
+        ]
+
     def _collect_links(self, result) -> List[str]:
         collected: List[str] = []
         link_groups = getattr(result, "links", {}) or {}
@@ -155,28 +346,47 @@ class TabTraversalManager:
         snippet = (html_fragment or "").strip()
         if not snippet:
             return ""
-        lower = snippet.lower()
-        if "<html" in lower and "</html" in lower:
+        # A full document opens and closes with <html>; only lowercase the edges.
+        head = snippet[:_EDGE_SCAN_CHARS].lower()
+        tail = snippet[-_EDGE_SCAN_CHARS:].lower()
+        if "<html" in head and "</html" in tail:
             return snippet
-        return f"<html><body>{snippet}</body></html>"
+        return "".join((_WRAP_PREFIX, snippet, _WRAP_SUFFIX))
+
+    @staticmethod
+    def _compile_heading(template: str) -> Callable[..., str]:
+        """
+        Return ``template.format`` when the template only uses the known placeholders
+        and formats cleanly, otherwise the default heading's formatter.
+        """
 
-    def _heading_for(self, block: TabMarkdownBlock) -> str:
-        template = self._settings.heading_template or "#### [Tab: {label}]"
-        group = block.group_title or "Tabs"
-        label = block.tab_label or "Tab"
         try:
-            return template.format(
-                group=group,
-                label=label,
-                index=block.index + 1,
-                group_index=block.group_index + 1,
-            ).strip()
-        except Exception:
-            return f"#### [Tab: {group} - {label}]"
+            # Only bare placeholders are allowed, so a template that formats the sample
+            # values below cannot fail later on a real block.
+            fields = {name for _, name, _, _ in string.Formatter().parse(template) if name}
+            unknown = fields - _HEADING_FIELDS
+            if unknown:
+                raise KeyError(", ".join(sorted(unknown)))
+            template.format(group="Tabs", label="Tab", index=1, group_index=1)
+        except Exception as exc:
+            logger.warning("Invalid tab heading template %r (%s); using default.", template, exc)
+            template = _DEFAULT_HEADING_TEMPLATE
+        return template.format
+
+    def _heading_for(self, block: TabMarkdownBlock) -> str:
+        return self._format_heading(
+            group=block.group_title or "Tabs",
+            label=block.tab_label or "Tab",
+            index=block.index + 1,
+            group_index=block.group_index + 1,
+        ).strip()
 
     def format_block(self, block: TabMarkdownBlock) -> str:
+        # ``markdown_text`` is stripped once when the block is built.
         heading = self._heading_for(block)
-        return f"{heading}\n\n{block.markdown_text.strip()}"
+        if not block.markdown_text:
+            return heading
+        return f"{heading}\n\n{block.markdown_text}"
 
     async def _get_session_page(
         self, crawler: AsyncWebCrawler, session_id: str
@@ -198,7 +408,15 @@ class TabTraversalManager:
             )
         except Exception:
             pass
-        await page.wait_for_timeout(600)
+        # Returns as soon as a tablist is rendered; the old fixed 600 ms settle delay
+        # is kept only as the upper bound for pages that have no tabs at all.
+        try:
+            await page.wait_for_function(
+                "() => document.querySelector('[role=\"tablist\"]') !== null",
+                timeout=_TABLIST_SETTLE_MS,
+            )
+        except Exception:
+            return captures
 
         tablists = page.locator('[role="tablist"]')
         try:
@@ -206,47 +424,24 @@ class TabTraversalManager:
         except Exception:
             return captures
 
-        total_collected = 0
-        for group_index in range(groups):
-            tablist = tablists.nth(group_index)
-            try:
-                group_title = await tablist.evaluate(self._group_title_script())
-            except Exception:
-                group_title = "Tabs"
-            group_title = (group_title or "Tabs").strip() or "Tabs"
+        # Titles and bulk harvests only read the DOM, so every group is read
+        # concurrently; clicking through tabs mutates the page and stays sequential.
+        group_reads = await asyncio.gather(
+            *[self._read_group(tablists.nth(index)) for index in range(groups)]
+        )
 
-            tabs = tablist.locator('[role="tab"]')
-            try:
-                tab_count = min(await tabs.count(), self._settings.max_tabs_per_group)
-            except Exception:
-                continue
+        for group_index, (group_title, panels) in enumerate(group_reads):
+            remaining = self._settings.max_total_tabs - len(captures)
+            if remaining <= 0:
+                break
+            if panels is None:
+                panels = await self._click_harvest(page, tablists.nth(group_index), remaining)
 
-            for tab_index in range(tab_count):
-                if total_collected >= self._settings.max_total_tabs:
+            for tab_index, label, html in panels:
+                if len(captures) >= self._settings.max_total_tabs:
                     break
-                tab = tabs.nth(tab_index)
-                try:
-                    label = (await tab.inner_text()).strip()
-                except Exception:
-                    label = ""
-                if not label:
+                if not label or not html:
                     continue
-
-                try:
-                    await tab.click()
-                    await page.wait_for_timeout(250)
-                    await self._wait_for_activation(page, tab)
-                    html = await self._extract_panel_html(page, tab)
-                except PlaywrightTimeoutError:
-                    logger.debug("Timed out while collecting tab %s", label)
-                    continue
-                except Exception as exc:  # pragma: no cover
-                    logger.debug("Playwright error for tab %s: %s", label, exc)
-                    continue
-
-                if not html:
-                    continue
-
                 captures.append(
                     TabCapture(
                         group_title=group_title,
@@ -257,83 +452,103 @@ class TabTraversalManager:
                         text_digest=self._digest_html(html),
                     )
                 )
-                total_collected += 1
 
-            if total_collected >= self._settings.max_total_tabs:
+        return captures
+
+    async def _read_group(
+        self, tablist
+    ) -> Tuple[str, Optional[List[Tuple[int, str, str]]]]:
+        group_title, panels = await asyncio.gather(
+            self._group_title(tablist), self._bulk_harvest(tablist)
+        )
+        return group_title, panels
+
+    async def _group_title(self, tablist) -> str:
+        try:
+            group_title = await tablist.evaluate(self._GROUP_TITLE_JS)
+        except Exception:
+            group_title = "Tabs"
+        return (group_title or "Tabs").strip() or "Tabs"
+
+    async def _bulk_harvest(self, tablist) -> Optional[List[Tuple[int, str, str]]]:
+        """
+        Read every tab label and panel of ``tablist`` in one round-trip, without clicking.
+
+        Returns ``None`` when some panel is not present in the DOM (lazily rendered
+        tabs), in which case the caller falls back to clicking through the tabs.
+        """
+
+        try:
+            harvested = await tablist.evaluate(
+                self._BULK_HARVEST_JS, self._settings.max_tabs_per_group
+            )
+        except Exception:
+            return None
+        if harvested is None:
+            return None
+        return [
+            (int(item["index"]), (item.get("label") or "").strip(), item.get("html") or "")
+            for item in harvested
+        ]
+
+    async def _click_harvest(
+        self, page: Page, tablist, limit: int
+    ) -> List[Tuple[int, str, str]]:
+        panels: List[Tuple[int, str, str]] = []
+        tabs = tablist.locator('[role="tab"]')
+        # One evaluate reads every label, so unlabelled tabs cost no round-trip.
+        try:
+            labels = await tabs.evaluate_all(self._TAB_LABELS_JS)
+        except Exception:
+            return panels
+
+        for tab_index, label in enumerate(labels[: self._settings.max_tabs_per_group]):
+            if len(panels) >= limit:
                 break
+            if not label:
+                continue
 
-        return captures
+            tab = tabs.nth(tab_index)
+            try:
+                await tab.click()
+                await self._wait_for_activation(page, tab)
+                html = await self._extract_panel_html(page, tab)
+            except PlaywrightTimeoutError:
+                logger.debug("Timed out while collecting tab %s", label)
+                continue
+            except Exception as exc:  # pragma: no cover
+                logger.debug("Playwright error for tab %s: %s", label, exc)
+                continue
+
+            if html:
+                panels.append((tab_index, label, html))
+        return panels
 
     async def _wait_for_activation(self, page: Page, tab_locator) -> None:
         handle = await tab_locator.element_handle()
         if handle is None:
             raise PlaywrightTimeoutError("Tab handle missing")
         await page.wait_for_function(
-            """
-            tab => {
-                if (!tab) return false;
-                const selected = tab.getAttribute('aria-selected');
-                const state = tab.dataset.state;
-                return selected === 'true' || state === 'active';
-            }
-            """,
+            self._WAIT_ACTIVE_JS,
             arg=handle,
             timeout=self._settings.wait_for_activation_ms,
         )
-        await page.wait_for_timeout(120)
 
     async def _extract_panel_html(self, page: Page, tab_locator) -> str:
         handle = await tab_locator.element_handle()
         if handle is None:
             return ""
         html = await page.evaluate(
-            """
-            tab => {
-                if (!tab) return '';
-                const controlId = tab.getAttribute('aria-controls');
-                let panel = controlId ? document.getElementById(controlId) : null;
-                if (!panel && tab.id) {
-                    panel = document.querySelector('[aria-labelledby="' + tab.id + '"]');
-                }
-                if (!panel) {
-                    const root = tab.closest('[data-component-part="code-group"], .code-group');
-                    if (root) {
-                        panel = root.querySelector('[role="tabpanel"]:not([hidden])');
-                    }
-                }
-                return panel ? panel.innerHTML || '' : '';
-            }
-            """,
+            self._EXTRACT_PANEL_JS,
             handle,
         )
         return html or ""
 
-    def _group_title_script(self) -> str:
-        return dedent(
-            """
-            (el) => {
-                if (!el) return 'Tabs';
-                const normalize = (value) => (value || '').replace(/\\s+/g, ' ').trim();
-                const aria = normalize(el.getAttribute('aria-label'));
-                if (aria) return aria;
-                let node = el;
-                for (let depth = 0; depth < 4 && node; depth += 1) {
-                    const prev = node.previousElementSibling;
-                    if (prev && /^H[1-6]$/.test(prev.tagName)) {
-                        return normalize(prev.textContent);
-                    }
-                    node = node.parentElement;
-                }
-                return 'Tabs';
-            }
-            """
-        )
-
-    def _digest_html(self, html: str) -> str:
-        normalized = (html or "").strip().lower()
-        if not normalized:
-            return ""
-        return str(abs(hash(normalized)))
+    def _digest_html(self, html: str) -> bytes:
+        # Panels are compared byte-for-byte; no need to lowercase a copy of the HTML.
+        if not html:
+            return b""
+        return hashlib.blake2b(html.encode("utf-8", "ignore"), digest_size=8).digest()
 
     def merge_into_markdown(
         self, base_markdown: str, blocks: List[TabMarkdownBlock]
@@ -343,6 +558,10 @@ class TabTraversalManager:
         for block in sorted(blocks, key=lambda b: (b.group_index, b.index)):
             grouped.setdefault(block.group_index, []).append(block)
 
+        # Locate every insertion point against the original text first, then build
+        # the result in one join instead of re-slicing the whole page per group.
+        anchored: List[Tuple[int, str]] = []
+        trailing: List[str] = []
         for group_blocks in grouped.values():
             anchor = next((b for b in group_blocks if b.index == 0), None)
             extras = [b for b in group_blocks if b.index > 0]
@@ -350,25 +569,20 @@ class TabTraversalManager:
                 continue
 
             insertion = "\n\n".join(self.format_block(b) for b in extras)
-            inserted = False
-            if anchor:
-                anchor_text = anchor.markdown_text.strip()
-                if anchor_text:
-                    pos = text.find(anchor_text)
-                    if pos != -1:
-                        insert_pos = pos + len(anchor_text)
-                        text = (
-                            text[:insert_pos]
-                            + "\n\n"
-                            + insertion
-                            + text[insert_pos:]
-                        )
-                        inserted = True
-
-            if not inserted:
-                if text:
-                    text = text.rstrip() + "\n\n" + insertion
-                else:
-                    text = insertion
-
-        return text
+            pos = -1
+            if anchor and anchor.markdown_text:
+                pos = text.find(anchor.markdown_text)
+            if pos == -1:
+                trailing.append(insertion)
+            else:
+                anchored.append((pos + len(anchor.markdown_text), insertion))
+
+        parts: List[str] = []
+        last = 0
+        for insert_pos, insertion in sorted(anchored, key=lambda item: item[0]):
+            parts.extend((text[last:insert_pos], "\n\n", insertion))
+            last = insert_pos
+        parts.append(text[last:])
+        body = "".join(parts)
+
+        return "\n\n".join(piece for piece in (body, *trailing) if piece)
@@ -1,52 +1,95 @@
 from __future__ import annotations
 
 import asyncio
+import random
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Deque, Dict, Optional, Tuple, Union
 
-from .utils import choose_random_delay, domain_key
+from .utils import UrlInfo, choose_random_delay, domain_key
+
+_NS_PER_SECOND = 1_000_000_000
+# Waits shorter than this are not worth a trip through the event loop.
+_MIN_SLEEP_SECONDS = 1e-6
 
 
 @dataclass
 class ThrottleController:
     """
     Simple rate limiter that enforces random delays per domain and honors robots directives.
+
+    Callers waiting on the same domain share a single timer: each one parks on a
+    future and the timer wakes them in reservation order, rescheduling itself for
+    the next waiter, so heavy fan-in on one host does not create a timer per caller.
     """
 
     min_seconds: float
     max_seconds: float
-    _last_hit: Dict[str, float] = field(default_factory=dict)
-    _lock: asyncio.Lock = field(init=False)
+    _last_hit: Dict[str, int] = field(default_factory=dict)
+    _wakers: Dict[str, Deque[Tuple[int, asyncio.Future]]] = field(default_factory=dict)
+    _timers: Dict[str, asyncio.TimerHandle] = field(default_factory=dict)
+    _rng: random.Random = field(default_factory=random.Random)
 
-    def __post_init__(self) -> None:
-        self._lock = asyncio.Lock()
-
-    async def wait_for_turn(self, url: str, robots_delay: Optional[float]) -> float:
+    async def wait_for_turn(
+        self, url: Union[str, UrlInfo], robots_delay: Optional[float]
+    ) -> float:
         """
         Block until the caller is allowed to make the next request to ``url``'s domain.
 
+        ``url`` may be a :class:`UrlInfo` the caller already parsed.
+
         Returns:
             The amount of seconds actually slept.
         """
 
-        base_delay = choose_random_delay(self.min_seconds, self.max_seconds)
+        base_delay = choose_random_delay(self.min_seconds, self.max_seconds, self._rng)
         enforced_delay = max(base_delay, float(robots_delay or 0))
+        base_ns = int(base_delay * _NS_PER_SECOND)
+        enforced_ns = int(enforced_delay * _NS_PER_SECOND)
         domain = domain_key(url)
 
-        async with self._lock:
-            last_hit = self._last_hit.get(domain)
-            now = time.monotonic()
+        # Reading and reserving the slot happens without an await in between, so the
+        # event loop already serializes callers for the same domain.
+        last_hit = self._last_hit.get(domain)
+        now = time.monotonic_ns()
+        if last_hit is None:
+            wait_ns = enforced_ns
+        else:
+            elapsed = now - last_hit
+            wait_ns = max(enforced_ns - elapsed, base_ns)
+        ready_at = now + wait_ns
+        self._last_hit[domain] = ready_at
 
-            if last_hit is None:
-                wait_for = enforced_delay
-            else:
-                elapsed = now - last_hit
-                wait_for = max(enforced_delay - elapsed, base_delay)
+        wait_for = wait_ns / _NS_PER_SECOND
+        if wait_for <= _MIN_SLEEP_SECONDS:
+            return wait_for
 
-            ready_at = now + wait_for
-            self._last_hit[domain] = ready_at
-
-        if wait_for > 0:
-            await asyncio.sleep(wait_for)
+        # Reservations for a domain only move forward, so appending keeps the queue
+        # ordered and the timer only ever needs to track its head.
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._wakers.setdefault(domain, deque()).append((ready_at, waiter))
+        if domain not in self._timers:
+            self._timers[domain] = loop.call_later(wait_for, self._wake, domain)
+        await waiter
         return wait_for
+
+    def _wake(self, domain: str) -> None:
+        """Release every waiter whose slot has come up and re-arm for the next one."""
+
+        del self._timers[domain]
+        queue = self._wakers[domain]
+        now = time.monotonic_ns()
+        while queue and queue[0][0] <= now:
+            _, waiter = queue.popleft()
+            # Cancelled callers keep their reserved slot but need no wake-up.
+            if not waiter.done():
+                waiter.set_result(None)
+        if not queue:
+            del self._wakers[domain]
+            return
+        delay = (queue[0][0] - now) / _NS_PER_SECOND
+        self._timers[domain] = asyncio.get_running_loop().call_later(
+            delay, self._wake, domain
+        )
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import posixpath
 import random
 import re
+import string
 from pathlib import Path
-from typing import List, Optional
+from typing import List, NamedTuple, Optional, Set, Union
 from urllib.parse import urljoin, urlparse, urlunparse
 
+# The same absolute URL is parsed repeatedly (resolved nav links, the page URL itself
+# by the queue, throttle and path builder), so parsing is memoized per URL string.
+_URL_CACHE_SIZE = 131_072
 
+
+# Segments that ``posixpath.normpath`` would rewrite: empty, ``.`` or ``..``.
+_UNNORMALIZED_PATH_RE = re.compile(r"//|/\.\.?(?:/|$)")
+
+
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
 def _normalized_path(path: str) -> str:
     if not path:
         return "/"
+    # Most crawled paths are already clean; normpath would hand them back unchanged.
+    if path.startswith("/") and not _UNNORMALIZED_PATH_RE.search(path):
+        return path
     # Ensure path starts with slash so normpath keeps hierarchy
     if not path.startswith("/"):
         path = f"/{path}"
@@ -23,6 +37,39 @@ def _normalized_path(path: str) -> str:
     return normalized or "/"
 
 
+class UrlInfo(NamedTuple):
+    """
+    One parse of a URL: scheme and netloc lowercased, path normalized.
+
+    Computed once by :func:`parse_url` and handed to the scope check and throttle so
+    neither parses the same URL again.
+    """
+
+    scheme: str
+    netloc: str
+    path: str
+    query: str
+    domain_key: str
+
+
+@functools.lru_cache(maxsize=_URL_CACHE_SIZE)
+def parse_url(url: str) -> UrlInfo:
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    return UrlInfo(
+        scheme=scheme,
+        netloc=netloc,
+        path=_normalized_path(parsed.path),
+        query=parsed.query,
+        domain_key=f"{scheme}://{netloc}",
+    )
+
+
+def _as_info(url: Union[str, UrlInfo]) -> UrlInfo:
+    return url if isinstance(url, UrlInfo) else parse_url(url)
+
+
 def normalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
     """
     Normalize a URL and optionally resolve it against ``base_url``.
@@ -33,43 +80,29 @@ def normalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
     if not url:
         return None
 
-    parsed = urlparse(url)
-    if not parsed.scheme:
+    info = parse_url(url)
+    if not info.scheme:
         if not base_url:
             return None
-        parsed = urlparse(urljoin(base_url, url))
+        info = parse_url(urljoin(base_url, url))
 
-    if parsed.scheme.lower() not in {"http", "https"}:
+    if info.scheme not in {"http", "https"}:
         return None
 
-    fragmentless = parsed._replace(fragment="")
-    normalized = urlunparse(
-        (
-            fragmentless.scheme.lower(),
-            fragmentless.netloc.lower(),
-            _normalized_path(fragmentless.path),
-            "",
-            fragmentless.query,
-            "",
-        )
-    )
-    return normalized
+    return urlunparse((info.scheme, info.netloc, info.path, "", info.query, ""))
 
 
 def derive_parent_url(url: str) -> str:
     """Compute the parent directory URL used for filtering child links."""
 
-    parsed = urlparse(url)
-    path = _normalized_path(parsed.path) or "/"
-    parent_path = posixpath.dirname(path.rstrip("/"))
+    info = parse_url(url)
+    parent_path = posixpath.dirname(info.path.rstrip("/"))
     if not parent_path.startswith("/"):
         parent_path = f"/{parent_path}"
     if parent_path != "/":
         parent_path = f"{parent_path}/"
 
-    result = urlunparse(
-        (parsed.scheme.lower(), parsed.netloc.lower(), parent_path or "/", "", "", "")
-    )
+    result = urlunparse((info.scheme, info.netloc, parent_path or "/", "", "", ""))
     return result
 
 
@@ -81,52 +114,59 @@ def shares_same_parent(url: str, parent_url: str) -> bool:
     return derive_parent_url(url) == parent_url
 
 
-def is_within_scope(url: str, scope_url: str) -> bool:
+def is_within_scope(url: Union[str, UrlInfo], scope_url: Union[str, UrlInfo]) -> bool:
     """Check whether ``url`` belongs to the subtree defined by ``scope_url``."""
 
     if not scope_url:
         return True
 
-    candidate = urlparse(url)
-    scope = urlparse(scope_url)
+    candidate = _as_info(url)
+    scope = _as_info(scope_url)
     if not candidate.scheme or not candidate.netloc:
         return False
-    if candidate.scheme.lower() != scope.scheme.lower():
+    if candidate.scheme != scope.scheme:
         return False
-    if candidate.netloc.lower() != scope.netloc.lower():
+    if candidate.netloc != scope.netloc:
         return False
 
-    candidate_path = _normalized_path(candidate.path)
-    scope_path = _normalized_path(scope.path)
-    if scope_path == "/":
+    if scope.path == "/":
         return True
-    if scope_path.endswith("/"):
-        return candidate_path.startswith(scope_path)
-    return candidate_path == scope_path or candidate_path.startswith(f"{scope_path}/")
+    if scope.path.endswith("/"):
+        return candidate.path.startswith(scope.path)
+    return candidate.path == scope.path or candidate.path.startswith(f"{scope.path}/")
 
 
-def domain_key(url: str) -> str:
-    parsed = urlparse(url)
-    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+def domain_key(url: Union[str, UrlInfo]) -> str:
+    return _as_info(url).domain_key
 
 
 _SANITIZE_RE = re.compile(r"[^a-zA-Z0-9_.-]+")
+_SLUG_SAFE_CHARS = frozenset(string.ascii_lowercase + string.digits + "_.-")
 
 
 def _slugify(segment: str) -> str:
-    segment = _SANITIZE_RE.sub("-", segment.strip().lower())
+    segment = segment.strip().lower()
+    # Most URL segments are already slug-safe; only run the regex when they are not.
+    if not _SLUG_SAFE_CHARS.issuperset(segment):
+        segment = _SANITIZE_RE.sub("-", segment)
     segment = segment.strip("-._")
     return segment or "index"
 
 
-def build_markdown_path(base_dir: Path, url: str) -> Path:
+
+def build_markdown_path(
+    base_dir: Path, url: str, created_dirs: Optional[Set[Path]] = None
+) -> Path:
     """
     Convert a URL into a deterministic markdown file path rooted at ``base_dir``.
+
+    ``created_dirs`` lets a caller memoize directories it already created, skipping
+    the mkdir syscalls for them; the caller owns that set and its lifetime.
     """
 
-    parsed = urlparse(url)
-    parts: List[str] = [parsed.netloc.lower()]
-    path_segments = [seg for seg in parsed.path.split("/") if seg]
+    info = parse_url(url)
+    parts: List[str] = [info.netloc]
+    path_segments = [seg for seg in info.path.split("/") if seg]
     if not path_segments:
         path_segments = ["index"]
     if len(path_segments) == 1:
@@ -137,18 +177,23 @@ def build_markdown_path(base_dir: Path, url: str) -> Path:
     directory = base_dir
     for segment in directory_segments:
         directory /= _slugify(segment)
-    directory.mkdir(parents=True, exist_ok=True)
+    if created_dirs is None or directory not in created_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+        if created_dirs is not None:
+            created_dirs.add(directory)
 
     filename = _slugify(path_segments[-1])
-    if parsed.query:
-        digest = hashlib.md5(parsed.query.encode("utf-8")).hexdigest()[:8]
+    if info.query:
+        digest = hashlib.md5(info.query.encode("utf-8")).hexdigest()[:8]
         filename = f"{filename}-{digest}"
     return directory / f"{filename}.md"
 
 
-def choose_random_delay(min_seconds: float, max_seconds: float) -> float:
+def choose_random_delay(
+    min_seconds: float, max_seconds: float, rng: Optional[random.Random] = None
+) -> float:
     """Helper used by throttling logic to pick a random wait time."""
 
     if max_seconds < min_seconds:
         max_seconds = min_seconds
-    return random.uniform(min_seconds, max_seconds)
+    return (rng or random).uniform(min_seconds, max_seconds)